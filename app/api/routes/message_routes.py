@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, Query, Path, Body
 from typing import Optional
 from datetime import datetime
+from uuid import UUID
 
 from app.controllers.message_controller import MessageController
 from app.schemas.message import (
@@ -23,9 +24,9 @@ async def send_message(
 
 @router.get("/conversation/{conversation_id}", response_model=PaginatedMessageResponse)
 async def get_conversation_messages(
-    conversation_id: int = Path(..., description="ID of the conversation"),
-    page: int = Query(1, description="Page number"),
-    limit: int = Query(20, description="Number of messages per page"),
+    conversation_id: UUID = Path(..., description="ID of the conversation"),
+    page_state: Optional[str] = Query(None, description="Paging cursor returned by the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Number of messages per page"),
     message_controller: MessageController = Depends()
 ) -> PaginatedMessageResponse:
     """
@@ -33,16 +34,16 @@ async def get_conversation_messages(
     """
     return await message_controller.get_conversation_messages(
         conversation_id=conversation_id,
-        page=page,
+        page_state=page_state,
         limit=limit
     )
 
 @router.get("/conversation/{conversation_id}/before", response_model=PaginatedMessageResponse)
 async def get_messages_before_timestamp(
-    conversation_id: int = Path(..., description="ID of the conversation"),
+    conversation_id: UUID = Path(..., description="ID of the conversation"),
     before_timestamp: datetime = Query(..., description="Get messages before this timestamp"),
-    page: int = Query(1, description="Page number"),
-    limit: int = Query(20, description="Number of messages per page"),
+    page_state: Optional[str] = Query(None, description="Paging cursor returned by the previous page"),
+    limit: int = Query(20, ge=1, le=100, description="Number of messages per page"),
     message_controller: MessageController = Depends()
 ) -> PaginatedMessageResponse:
     """
@@ -51,6 +52,6 @@ async def get_messages_before_timestamp(
     return await message_controller.get_messages_before_timestamp(
         conversation_id=conversation_id,
         before_timestamp=before_timestamp,
-        page=page,
+        page_state=page_state,
         limit=limit
     ) 
\ No newline at end of file
@@ -1,4 +1,5 @@
 from typing import Optional
+from uuid import UUID
 from fastapi import HTTPException, status
 
 from app.schemas.conversation import ConversationResponse, PaginatedConversationResponse
@@ -12,7 +13,7 @@ class ConversationController:
     async def get_user_conversations(
         self, 
         user_id: int,
-        page: int = 1,
+        page_state: Optional[str] = None,
         limit: int = 20
     ) -> PaginatedConversationResponse:
         """
@@ -20,47 +21,37 @@ class ConversationController:
         
         Args:
             user_id: ID of the user
-            page: Page number
+            page_state: Paging cursor returned by the previous page
             limit: Number of conversations per page
             
         Returns:
             Paginated list of conversations
-            
-        Raises:
-            HTTPException: If retrieving conversations fails
         """
-        try:
-            # Get conversations for the user
-            result = await ConversationModel.get_user_conversations(
-                user_id=user_id,
-                page=page,
-                limit=limit
-            )
-            
-            # Convert to response model
-            conversations = [
-                ConversationResponse(
-                    id=conv["id"],
-                    user1_id=conv["user1_id"],
-                    user2_id=conv["user2_id"],
-                    last_message_at=conv["last_message_at"],
-                    last_message_content=conv["last_message_content"]
-                ) for conv in result["data"]
-            ]
-            
-            return PaginatedConversationResponse(
-                total=result["total"],
-                page=result["page"],
-                limit=result["limit"],
-                data=conversations
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to get user conversations: {str(e)}"
-            )
+        # Get conversations for the user
+        result = await ConversationModel.get_user_conversations(
+            user_id=user_id,
+            page_state=page_state,
+            limit=limit
+        )
+        
+        # Convert to response model
+        conversations = [
+            ConversationResponse(
+                id=conv["id"],
+                user1_id=conv["user1_id"],
+                user2_id=conv["user2_id"],
+                last_message_at=conv["last_message_at"],
+                last_message_content=conv["last_message_content"]
+            ) for conv in result["data"]
+        ]
+        
+        return PaginatedConversationResponse(
+            limit=result["limit"],
+            next_page_state=result["next_page_state"],
+            data=conversations
+        )
     
-    async def get_conversation(self, conversation_id: int) -> ConversationResponse:
+    async def get_conversation(self, conversation_id: UUID) -> ConversationResponse:
         """
         Get a specific conversation by ID
         
@@ -73,28 +64,27 @@ class ConversationController:
         Raises:
             HTTPException: If conversation not found
         """
-        try:
-            # Get the conversation
-            conversation = await ConversationModel.get_conversation(conversation_id)
-            
-            if not conversation:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Conversation not found"
-                )
-            
-            # Return conversation response
-            return ConversationResponse(
-                id=conversation["id"],
-                user1_id=conversation["user1_id"],
-                user2_id=conversation["user2_id"],
-                last_message_at=conversation["last_message_at"],
-                last_message_content=conversation["last_message_content"]
+        # Conversation IDs are TimeUUIDs; Cassandra rejects any other version
+        if conversation_id.version != 1:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found"
             )
-        except HTTPException:
-            raise
-        except Exception as e:
+        
+        # Get the conversation
+        conversation = await ConversationModel.get_conversation(conversation_id)
+        
+        if not conversation:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to get conversation: {str(e)}"
-            )
\ No newline at end of file
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found"
+            )
+        
+        # Return conversation response
+        return ConversationResponse(
+            id=conversation["id"],
+            user1_id=conversation["user1_id"],
+            user2_id=conversation["user2_id"],
+            last_message_at=conversation["last_message_at"],
+            last_message_content=conversation["last_message_content"]
+        )
\ No newline at end of file
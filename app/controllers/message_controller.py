@@ -1,5 +1,6 @@
 from typing import Optional
 from datetime import datetime
+from uuid import UUID
 from fastapi import HTTPException, status
 
 from app.schemas.message import MessageCreate, MessageResponse, PaginatedMessageResponse
@@ -19,44 +20,25 @@ class MessageController:
             
         Returns:
             The created message with metadata
-        
-        Raises:
-            HTTPException: If message sending fails
         """
-        try:
-            # Get or create a conversation between sender and receiver
-            conversation = await ConversationModel.create_or_get_conversation(
-                message_data.sender_id,
-                message_data.receiver_id
-            )
-            
-            # Create the message
-            message = await MessageModel.create_message(
-                sender_id=message_data.sender_id,
-                receiver_id=message_data.receiver_id,
-                content=message_data.content,
-                conversation_id=conversation["id"]
-            )
-            
-            # Return the message response
-            return MessageResponse(
-                id=int(message["id"].split("-")[0], 16),  # Convert UUID prefix to int for simplicity
-                conversation_id=message["conversation_id"],
-                sender_id=message["sender_id"],
-                receiver_id=message["receiver_id"],
-                content=message["content"],
-                created_at=message["created_at"]
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to send message: {str(e)}"
-            )
+        # Get or create a conversation between sender and receiver
+        conversation = await ConversationModel.create_or_get_conversation(
+            message_data.sender_id,
+            message_data.receiver_id
+        )
+        
+        # Create the message
+        return await MessageModel.create_message(
+            sender_id=message_data.sender_id,
+            receiver_id=message_data.receiver_id,
+            content=message_data.content,
+            conversation_id=conversation["id"]
+        )
     
     async def get_conversation_messages(
         self, 
-        conversation_id: int, 
-        page: int = 1, 
+        conversation_id: UUID, 
+        page_state: Optional[str] = None, 
         limit: int = 20
     ) -> PaginatedMessageResponse:
         """
@@ -64,7 +46,7 @@ class MessageController:
         
         Args:
             conversation_id: ID of the conversation
-            page: Page number
+            page_state: Paging cursor returned by the previous page
             limit: Number of messages per page
             
         Returns:
@@ -73,53 +55,40 @@ class MessageController:
         Raises:
             HTTPException: If conversation not found or access denied
         """
-        try:
-            # Get conversation to verify it exists
-            conversation = await ConversationModel.get_conversation(conversation_id)
-            if not conversation:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Conversation not found"
-                )
-            
-            # Get messages for the conversation
-            result = await MessageModel.get_conversation_messages(
-                conversation_id=conversation_id,
-                page=page,
-                limit=limit
-            )
-            
-            # Convert to response model
-            messages = [
-                MessageResponse(
-                    id=int(msg["id"].split("-")[0], 16),  # Convert UUID prefix to int
-                    conversation_id=msg["conversation_id"],
-                    sender_id=msg["sender_id"],
-                    receiver_id=msg["receiver_id"],
-                    content=msg["content"],
-                    created_at=msg["created_at"]
-                ) for msg in result["data"]
-            ]
-            
-            return PaginatedMessageResponse(
-                total=result["total"],
-                page=result["page"],
-                limit=result["limit"],
-                data=messages
+        # Conversation IDs are TimeUUIDs; Cassandra rejects any other version
+        if conversation_id.version != 1:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found"
             )
-        except HTTPException:
-            raise
-        except Exception as e:
+        
+        # Get conversation to verify it exists
+        conversation = await ConversationModel.get_conversation(conversation_id)
+        if not conversation:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to get conversation messages: {str(e)}"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found"
             )
+        
+        # Get messages for the conversation
+        result = await MessageModel.get_conversation_messages(
+            conversation_id=conversation_id,
+            page_state=page_state,
+            limit=limit
+        )
+        
+        return PaginatedMessageResponse(
+            limit=result["limit"],
+            has_more=result["next_page_state"] is not None,
+            next_page_state=result["next_page_state"],
+            data=result["data"]
+        )
     
     async def get_messages_before_timestamp(
         self, 
-        conversation_id: int, 
+        conversation_id: UUID, 
         before_timestamp: datetime,
-        page: int = 1, 
+        page_state: Optional[str] = None, 
         limit: int = 20
     ) -> PaginatedMessageResponse:
         """
@@ -128,7 +97,7 @@ class MessageController:
         Args:
             conversation_id: ID of the conversation
             before_timestamp: Get messages before this timestamp
-            page: Page number
+            page_state: Paging cursor returned by the previous page
             limit: Number of messages per page
             
         Returns:
@@ -137,45 +106,32 @@ class MessageController:
         Raises:
             HTTPException: If conversation not found or access denied
         """
-        try:
-            # Get conversation to verify it exists
-            conversation = await ConversationModel.get_conversation(conversation_id)
-            if not conversation:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Conversation not found"
-                )
-            
-            # Get messages before timestamp
-            result = await MessageModel.get_messages_before_timestamp(
-                conversation_id=conversation_id,
-                before_timestamp=before_timestamp,
-                page=page,
-                limit=limit
-            )
-            
-            # Convert to response model
-            messages = [
-                MessageResponse(
-                    id=int(msg["id"].split("-")[0], 16),  # Convert UUID prefix to int
-                    conversation_id=msg["conversation_id"],
-                    sender_id=msg["sender_id"],
-                    receiver_id=msg["receiver_id"],
-                    content=msg["content"],
-                    created_at=msg["created_at"]
-                ) for msg in result["data"]
-            ]
-            
-            return PaginatedMessageResponse(
-                total=result["total"],
-                page=result["page"],
-                limit=result["limit"],
-                data=messages
+        # Conversation IDs are TimeUUIDs; Cassandra rejects any other version
+        if conversation_id.version != 1:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found"
             )
-        except HTTPException:
-            raise
-        except Exception as e:
+        
+        # Get conversation to verify it exists
+        conversation = await ConversationModel.get_conversation(conversation_id)
+        if not conversation:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to get messages before timestamp: {str(e)}"
-            )
\ No newline at end of file
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Conversation not found"
+            )
+        
+        # Get messages before timestamp
+        result = await MessageModel.get_messages_before_timestamp(
+            conversation_id=conversation_id,
+            before_timestamp=before_timestamp,
+            page_state=page_state,
+            limit=limit
+        )
+        
+        return PaginatedMessageResponse(
+            limit=result["limit"],
+            has_more=result["next_page_state"] is not None,
+            next_page_state=result["next_page_state"],
+            data=result["data"]
+        )
\ No newline at end of file
@@ -3,18 +3,26 @@ Cassandra client for the Messenger application.
 This provides a connection to the Cassandra database.
 """
 import os
+import asyncio
+import base64
 import uuid
-import time
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-from cassandra.cluster import Cluster, Session, NoHostAvailable
+from cassandra import InvalidRequest
+from cassandra.cluster import Cluster, Session, ResponseFuture, ResultSet
 from cassandra.auth import PlainTextAuthProvider
-from cassandra.query import SimpleStatement, dict_factory
+from cassandra.io.asyncioreactor import AsyncioConnection
+from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
+from cassandra.protocol import ProtocolException
+from cassandra.query import BatchStatement, BatchType, PreparedStatement, dict_factory
 
 logger = logging.getLogger(__name__)
 
+class InvalidPageStateError(ValueError):
+    """Raised when a client-supplied paging cursor cannot be used."""
+
 class CassandraClient:
     """Singleton Cassandra client for the application."""
     
@@ -34,30 +42,37 @@ class CassandraClient:
         self.host = os.getenv("CASSANDRA_HOST", "cassandra")  # default changed from "localhost" to "cassandra"
         self.port = int(os.getenv("CASSANDRA_PORT", "9042"))
         self.keyspace = os.getenv("CASSANDRA_KEYSPACE", "messenger")
+        self.max_in_flight = int(os.getenv("CASSANDRA_MAX_INFLIGHT", "256"))
         
         self.cluster = None
         self.session = None
-        self.connect()
+        self._prepared: Dict[str, PreparedStatement] = {}
+        # Bounds the number of async queries in flight from this process
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
         
         self._initialized = True
     
     def connect(self) -> None:
-        """Connect to the Cassandra cluster with retries."""
-        retries = 10
-        for i in range(retries):
-            try:
-                self.cluster = Cluster([self.host])
-                self.session = self.cluster.connect(self.keyspace)
-                self.session.row_factory = dict_factory
-                logger.info(f"Connected to Cassandra at {self.host}:{self.port}, keyspace: {self.keyspace}")
-                return
-            except NoHostAvailable as e:
-                logger.warning(f"[{i+1}/{retries}] Cassandra not available yet, retrying in 3s...")
-                time.sleep(3)
-            except Exception as e:
-                logger.error(f"Unexpected error during Cassandra connection: {str(e)}")
-                time.sleep(3)
-        raise Exception("Failed to connect to Cassandra after multiple retries.")
+        """
+        Connect to the Cassandra cluster.
+        
+        Makes a single attempt and never sleeps, so it is safe to reach from
+        request handlers; the application's startup event does the retrying.
+        """
+        cluster = Cluster(
+            [self.host],
+            connection_class=AsyncioConnection,
+            load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy())
+        )
+        try:
+            session = cluster.connect(self.keyspace)
+        except Exception:
+            cluster.shutdown()
+            raise
+        session.row_factory = dict_factory
+        self.cluster = cluster
+        self.session = session
+        logger.info(f"Connected to Cassandra at {self.host}:{self.port}, keyspace: {self.keyspace}")
     
     def close(self) -> None:
         """Close the Cassandra connection."""
@@ -65,13 +80,43 @@ class CassandraClient:
             self.cluster.shutdown()
             logger.info("Cassandra connection closed")
     
-    def execute(self, query: str, params: dict = None) -> List[Dict[str, Any]]:
+    def _prepare(self, query: str) -> PreparedStatement:
+        """
+        Get the prepared statement for a query, preparing it on first use.
+        
+        Args:
+            query: The CQL query string, using ? placeholders
+            
+        Returns:
+            The cached prepared statement
+        """
+        prepared = self._prepared.get(query)
+        if prepared is None:
+            prepared = self.session.prepare(query)
+            self._prepared[query] = prepared
+        return prepared
+    
+    def prepare_all(self, queries: List[str]) -> None:
+        """
+        Prepare a set of queries up front so requests never pay for it.
+        
+        Args:
+            queries: The CQL query strings, using ? placeholders
+        """
+        if not self.session:
+            self.connect()
+        
+        for query in queries:
+            self._prepare(query)
+        logger.info(f"Prepared {len(queries)} statements")
+    
+    def execute(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
         """
         Execute a CQL query.
         
         Args:
-            query: The CQL query string
-            params: The parameters for the query
+            query: The CQL query string, using ? placeholders
+            params: The positional parameters for the query
             
         Returns:
             List of rows as dictionaries
@@ -80,20 +125,19 @@ class CassandraClient:
             self.connect()
         
         try:
-            statement = SimpleStatement(query)
-            result = self.session.execute(statement, params or {})
+            result = self.session.execute(self._prepare(query), params or ())
             return list(result)
         except Exception as e:
             logger.error(f"Query execution failed: {str(e)}")
             raise
     
-    def execute_async(self, query: str, params: dict = None):
+    def execute_async(self, query: str, params: tuple = None):
         """
         Execute a CQL query asynchronously.
         
         Args:
-            query: The CQL query string
-            params: The parameters for the query
+            query: The CQL query string, using ? placeholders
+            params: The positional parameters for the query
             
         Returns:
             Async result object
@@ -102,12 +146,143 @@ class CassandraClient:
             self.connect()
         
         try:
-            statement = SimpleStatement(query)
-            return self.session.execute_async(statement, params or {})
+            return self.session.execute_async(self._prepare(query), params or ())
         except Exception as e:
             logger.error(f"Async query execution failed: {str(e)}")
             raise
     
+    async def _await_response(self, response_future: ResponseFuture) -> ResultSet:
+        """
+        Bridge a driver ResponseFuture to the running asyncio event loop.
+        
+        Args:
+            response_future: The future returned by session.execute_async
+            
+        Returns:
+            The first page of results wrapped in a ResultSet
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        def set_result(rows):
+            if not future.done():
+                future.set_result(ResultSet(response_future, rows))
+        
+        def set_exception(exc):
+            if not future.done():
+                future.set_exception(exc)
+        
+        response_future.add_callbacks(
+            lambda rows: loop.call_soon_threadsafe(set_result, rows),
+            lambda exc: loop.call_soon_threadsafe(set_exception, exc)
+        )
+        return await future
+    
+    async def execute_aio(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+        """
+        Execute a CQL query without blocking the event loop.
+        
+        Args:
+            query: The CQL query string, using ? placeholders
+            params: The positional parameters for the query
+            
+        Returns:
+            List of rows as dictionaries
+        """
+        if not self.session:
+            self.connect()
+        
+        try:
+            async with self._in_flight:
+                response_future = self.session.execute_async(self._prepare(query), params or ())
+                result = await self._await_response(response_future)
+            return list(result)
+        except Exception as e:
+            logger.error(f"Query execution failed: {str(e)}")
+            raise
+    
+    async def execute_batch_aio(
+        self,
+        statements: List[Tuple[str, tuple]],
+        batch_type: BatchType = BatchType.UNLOGGED
+    ) -> None:
+        """
+        Execute several CQL statements as a single batch request.
+        
+        Args:
+            statements: List of (query, params) pairs, using ? placeholders
+            batch_type: The batch type, UNLOGGED by default
+        """
+        if not self.session:
+            self.connect()
+        
+        try:
+            batch = BatchStatement(batch_type=batch_type)
+            for query, params in statements:
+                batch.add(self._prepare(query), params)
+            async with self._in_flight:
+                response_future = self.session.execute_async(batch)
+                await self._await_response(response_future)
+        except Exception as e:
+            logger.error(f"Batch execution failed: {str(e)}")
+            raise
+    
+    async def execute_paged_aio(
+        self,
+        query: str,
+        params: tuple = None,
+        fetch_size: int = 20,
+        paging_state: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Execute a CQL query and return a single page of results without
+        blocking the event loop.
+        
+        Args:
+            query: The CQL query string, using ? placeholders
+            params: The positional parameters for the query
+            fetch_size: Number of rows to fetch for this page
+            paging_state: Opaque cursor returned by the previous page, if any
+            
+        Returns:
+            Tuple of (rows as dictionaries, cursor for the next page or None)
+            
+        Raises:
+            InvalidPageStateError: If the cursor is malformed or belongs to another query
+        """
+        if not self.session:
+            self.connect()
+        
+        raw_paging_state = None
+        if paging_state:
+            try:
+                raw_paging_state = base64.urlsafe_b64decode(paging_state)
+            except ValueError:
+                raise InvalidPageStateError("Invalid page_state cursor")
+        
+        try:
+            statement = self._prepare(query).bind(params or ())
+            statement.fetch_size = fetch_size
+            async with self._in_flight:
+                response_future = self.session.execute_async(
+                    statement,
+                    paging_state=raw_paging_state
+                )
+                result = await self._await_response(response_future)
+            next_page_state = None
+            if result.has_more_pages:
+                next_page_state = base64.urlsafe_b64encode(result.paging_state).decode()
+            return list(result.current_rows), next_page_state
+        except (InvalidRequest, ProtocolException) as e:
+            # The server rejects paging states that were not issued for this query
+            if raw_paging_state is not None:
+                raise InvalidPageStateError("Invalid page_state cursor") from e
+            logger.error(f"Paged query execution failed: {str(e)}")
+            raise
+        except Exception as e:
+            logger.error(f"Paged query execution failed: {str(e)}")
+            raise
+    
     def get_session(self) -> Session:
         """Get the Cassandra session."""
         if not self.session:
@@ -2,13 +2,15 @@ import logging
 import sys
 import asyncio
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.routes import message_router, conversation_router
 from app.controllers.message_controller import MessageController
 from app.controllers.conversation_controller import ConversationController
-from app.db.cassandra_client import get_cassandra_client
+from app.db.cassandra_client import InvalidPageStateError, get_cassandra_client
+from app.models.cassandra_models import QUERIES
 
 
 logging.basicConfig(
@@ -43,6 +45,21 @@ app.dependency_overrides[ConversationController] = get_conversation_controller
 app.include_router(message_router)
 app.include_router(conversation_router)
 
+@app.exception_handler(InvalidPageStateError)
+async def invalid_page_state_handler(request: Request, exc: InvalidPageStateError):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": str(exc)}
+    )
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    logger.error(f"Unhandled error on {request.method} {request.url.path}: {type(exc).__name__}")
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={"detail": "Internal server error"}
+    )
+
 @app.get("/")
 async def root():
     return {"message": "FB Messenger API is running with Cassandra backend"}
@@ -50,20 +67,24 @@ async def root():
 @app.on_event("startup")
 async def startup_event():
     logger.info("Initializing application...")
-    max_retries = 20
+    cassandra = get_cassandra_client()
+    # Cassandra may still be starting, or its keyspace and tables may not
+    # exist until scripts/setup_db.py has run, so keep retrying for up to
+    # ten minutes
+    max_retries = 120
 
     for i in range(max_retries):
         try:
-            cassandra = get_cassandra_client()
             cassandra.get_session()
             logger.info("Cassandra connection established")
-            return
+            cassandra.prepare_all(QUERIES)
+            break
         except Exception as e:
             logger.warning(f"[{i+1}/{max_retries}] Cassandra not ready yet: {str(e)}")
-            await asyncio.sleep(3)
-
-    logger.error("Failed to connect to Cassandra after multiple retries. Exiting.")
-    sys.exit(1)
+            await asyncio.sleep(5)
+    else:
+        logger.error("Failed to connect to Cassandra after multiple retries. Exiting.")
+        sys.exit(1)
 
 
 @app.on_event("shutdown")
@@ -2,12 +2,118 @@
 Models for interacting with Cassandra tables.
 """
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
-from app.db.cassandra_client import get_cassandra_client
+from cassandra.util import uuid_from_time
+
+from app.db.cassandra_client import InvalidPageStateError, get_cassandra_client
+from app.schemas.message import MessageResponse
+
+INSERT_MESSAGE_CQL = """
+INSERT INTO messages_by_conversation (
+    conversation_id, message_timestamp, message_id,
+    sender_id, receiver_id, content
+) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_CONVERSATION_BY_USER_CQL = """
+INSERT INTO conversations_by_user (
+    user_id, bucket_month, last_message_timestamp, conversation_id,
+    other_user_id, last_message_content
+) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_LAST_MESSAGE_CQL = """
+INSERT INTO conversation_last_message (
+    conversation_id, message_timestamp, sender_id, content
+) VALUES (?, ?, ?, ?)
+"""
+
+SELECT_MESSAGES_CQL = """
+SELECT message_id, conversation_id, sender_id, receiver_id,
+       content, message_timestamp
+FROM messages_by_conversation
+WHERE conversation_id = ?
+"""
+
+SELECT_MESSAGES_BEFORE_CQL = """
+SELECT message_id, conversation_id, sender_id, receiver_id,
+       content, message_timestamp
+FROM messages_by_conversation
+WHERE conversation_id = ?
+AND message_timestamp < ?
+"""
+
+SELECT_PARTICIPANTS_CQL = """
+SELECT conversation_id, user1_id, user2_id, created_at
+FROM conversation_participants
+WHERE conversation_id = ?
+"""
+
+SELECT_USER_CONVERSATIONS_CQL = """
+SELECT user_id, last_message_timestamp, conversation_id,
+       other_user_id, last_message_content
+FROM conversations_by_user
+WHERE user_id = ? AND bucket_month = ?
+"""
+
+SELECT_LAST_MESSAGE_CQL = """
+SELECT message_timestamp, content
+FROM conversation_last_message
+WHERE conversation_id = ?
+"""
+
+SELECT_CONVERSATION_LOOKUP_CQL = """
+SELECT conversation_id
+FROM conversation_lookup
+WHERE user1_id = ? AND user2_id = ?
+"""
+
+INSERT_PARTICIPANTS_CQL = """
+INSERT INTO conversation_participants (
+    conversation_id, user1_id, user2_id, created_at
+) VALUES (?, ?, ?, ?)
+"""
+
+INSERT_CONVERSATION_LOOKUP_CQL = """
+INSERT INTO conversation_lookup (
+    user1_id, user2_id, conversation_id
+) VALUES (?, ?, ?)
+"""
+
+# Every statement above, prepared at startup so requests never pay for it
+QUERIES = [
+    INSERT_MESSAGE_CQL,
+    INSERT_CONVERSATION_BY_USER_CQL,
+    INSERT_LAST_MESSAGE_CQL,
+    SELECT_MESSAGES_CQL,
+    SELECT_MESSAGES_BEFORE_CQL,
+    SELECT_PARTICIPANTS_CQL,
+    SELECT_USER_CONVERSATIONS_CQL,
+    SELECT_LAST_MESSAGE_CQL,
+    SELECT_CONVERSATION_LOOKUP_CQL,
+    INSERT_PARTICIPANTS_CQL,
+    INSERT_CONVERSATION_LOOKUP_CQL,
+]
+
+# conversations_by_user is partitioned by (user_id, bucket_month) so busy users
+# spread their rows over one partition per month; listings only look this many
+# months back
+CONVERSATION_BUCKET_LOOKBACK_MONTHS = 3
+
+
+def _bucket_month(timestamp: datetime) -> int:
+    """Return the conversations_by_user bucket (YYYYMM) for a timestamp."""
+    return timestamp.year * 100 + timestamp.month
+
+
+def _previous_bucket_month(bucket_month: int) -> int:
+    """Return the bucket for the month before the given one."""
+    year, month = divmod(bucket_month, 100)
+    return (year - 1) * 100 + 12 if month == 1 else bucket_month - 1
 
-cassandra_client = get_cassandra_client()
 
 class MessageModel:
     """
@@ -19,18 +125,13 @@ class MessageModel:
         sender_id: int,
         receiver_id: int,
         content: str,
-        conversation_id: int
-    ) -> Dict[str, Any]:
+        conversation_id: uuid.UUID
+    ) -> MessageResponse:
+        cassandra_client = get_cassandra_client()
         message_id = uuid.uuid4()
         message_timestamp = datetime.now()
 
-        query = """
-        INSERT INTO messages_by_conversation (
-            conversation_id, message_timestamp, message_id, 
-            sender_id, receiver_id, content
-        ) VALUES (%s, %s, %s, %s, %s, %s)
-        """
-        params = (
+        message_params = (
             conversation_id, 
             message_timestamp, 
             message_id, 
@@ -38,122 +139,78 @@ class MessageModel:
             receiver_id, 
             content
         )
-        cassandra_client.execute(query, params)
-
-        update_conversation_query = """
-        INSERT INTO conversations_by_user (
-            user_id, last_message_timestamp, conversation_id, 
-            other_user_id, last_message_content
-        ) VALUES (%s, %s, %s, %s, %s)
-        """
+
+        bucket_month = _bucket_month(message_timestamp)
+
         sender_params = (
             sender_id,
+            bucket_month,
             message_timestamp,
             conversation_id,
             receiver_id,
             content
         )
-        cassandra_client.execute(update_conversation_query, sender_params)
 
         receiver_params = (
             receiver_id,
+            bucket_month,
             message_timestamp,
             conversation_id,
             sender_id,
             content
         )
-        cassandra_client.execute(update_conversation_query, receiver_params)
 
-        return {
-            "id": str(message_id),
-            "conversation_id": conversation_id,
-            "sender_id": sender_id,
-            "receiver_id": receiver_id,
-            "content": content,
-            "created_at": message_timestamp
-        }
+        last_message_params = (
+            conversation_id,
+            message_timestamp,
+            sender_id,
+            content
+        )
+
+        # The rows live in different partitions, so an UNLOGGED batch
+        # saves the round-trips without paying for the batch log
+        await cassandra_client.execute_batch_aio([
+            (INSERT_MESSAGE_CQL, message_params),
+            (INSERT_CONVERSATION_BY_USER_CQL, sender_params),
+            (INSERT_CONVERSATION_BY_USER_CQL, receiver_params),
+            (INSERT_LAST_MESSAGE_CQL, last_message_params)
+        ])
+
+        return MessageResponse(
+            id=message_id,
+            conversation_id=conversation_id,
+            sender_id=sender_id,
+            receiver_id=receiver_id,
+            content=content,
+            created_at=message_timestamp
+        )
 
     @staticmethod
-    async def get_conversation_messages(conversation_id: int, page: int = 1, limit: int = 20) -> Dict[str, Any]:
-        fetch_limit = page * limit
-
-        query = """
-        SELECT message_id, conversation_id, sender_id, receiver_id, 
-               content, message_timestamp
-        FROM messages_by_conversation
-        WHERE conversation_id = %s
-        LIMIT %s
-        """
-        params = (conversation_id, fetch_limit)
-        rows = cassandra_client.execute(query, params)
-
-        messages = []
-        for row in rows:
-            messages.append({
-                "id": str(row["message_id"]),
-                "conversation_id": row["conversation_id"],
-                "sender_id": row["sender_id"],
-                "receiver_id": row["receiver_id"],
-                "content": row["content"],
-                "created_at": row["message_timestamp"]
-            })
+    async def get_conversation_messages(conversation_id: uuid.UUID, page_state: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        cassandra_client = get_cassandra_client()
+        params = (conversation_id,)
+        rows, next_page_state = await cassandra_client.execute_paged_aio(SELECT_MESSAGES_CQL, params, limit, page_state)
 
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paged_messages = messages[start_idx:end_idx]
+        messages = [MessageResponse.model_validate(row) for row in rows]
 
         return {
-            "total": len(messages),
-            "page": page,
             "limit": limit,
-            "data": paged_messages
+            "next_page_state": next_page_state,
+            "data": messages
         }
 
     @staticmethod
-    async def get_messages_before_timestamp(conversation_id: int, before_timestamp: datetime, page: int = 1, limit: int = 20) -> Dict[str, Any]:
-        fetch_limit = page * limit
-
-        query = """
-        SELECT message_id, conversation_id, sender_id, receiver_id, 
-               content, message_timestamp
-        FROM messages_by_conversation
-        WHERE conversation_id = %s
-        AND message_timestamp < %s
-        LIMIT %s
-        """
-        params = (conversation_id, before_timestamp, fetch_limit)
-        rows = cassandra_client.execute(query, params)
-
-        messages = []
-        for row in rows:
-            messages.append({
-                "id": str(row["message_id"]),
-                "conversation_id": row["conversation_id"],
-                "sender_id": row["sender_id"],
-                "receiver_id": row["receiver_id"],
-                "content": row["content"],
-                "created_at": row["message_timestamp"]
-            })
-
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paged_messages = messages[start_idx:end_idx]
+    async def get_messages_before_timestamp(conversation_id: uuid.UUID, before_timestamp: datetime, page_state: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        cassandra_client = get_cassandra_client()
+        params = (conversation_id, before_timestamp)
+        rows, next_page_state = await cassandra_client.execute_paged_aio(SELECT_MESSAGES_BEFORE_CQL, params, limit, page_state)
 
-        count_query = """
-        SELECT COUNT(*) as count
-        FROM messages_by_conversation
-        WHERE conversation_id = %s
-        AND message_timestamp < %s
-        """
-        count_params = (conversation_id, before_timestamp)
-        count_result = cassandra_client.execute(count_query, count_params)
-        total = count_result[0]["count"] if count_result else 0
+        messages = [MessageResponse.model_validate(row) for row in rows]
 
         return {
-            "total": total,
-            "page": page,
             "limit": limit,
-            "data": paged_messages
+            "next_page_state": next_page_state,
+            "data": messages
         }
 
 
@@ -162,76 +219,106 @@ class ConversationModel:
     Conversation model for interacting with the conversations-related tables.
     """
 
+    # Participants never change once a conversation exists, so they are kept
+    # in a bounded LRU cache keyed by conversation_id
+    _participants_cache: "OrderedDict[uuid.UUID, Dict[str, Any]]" = OrderedDict()
+    _participants_cache_size = 10_000
+
     @staticmethod
-    async def get_user_conversations(user_id: int, page: int = 1, limit: int = 20) -> Dict[str, Any]:
-        fetch_limit = page * limit
-
-        query = """
-        SELECT user_id, last_message_timestamp, conversation_id, 
-               other_user_id, last_message_content
-        FROM conversations_by_user
-        WHERE user_id = %s
-        LIMIT %s
-        """
-        params = (user_id, fetch_limit)
-        rows = cassandra_client.execute(query, params)
+    def _cache_participants(conversation_id: uuid.UUID, participants: Dict[str, Any]) -> None:
+        cache = ConversationModel._participants_cache
+        cache[conversation_id] = participants
+        cache.move_to_end(conversation_id)
+        if len(cache) > ConversationModel._participants_cache_size:
+            cache.popitem(last=False)
 
+    @staticmethod
+    async def _get_participants(conversation_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+        cache = ConversationModel._participants_cache
+        participants = cache.get(conversation_id)
+        if participants is not None:
+            cache.move_to_end(conversation_id)
+            return participants
+
+        cassandra_client = get_cassandra_client()
+        params = (conversation_id,)
+        rows = await cassandra_client.execute_aio(SELECT_PARTICIPANTS_CQL, params)
+
+        if not rows:
+            return None
+
+        participants = rows[0]
+        ConversationModel._cache_participants(conversation_id, participants)
+        return participants
+
+    @staticmethod
+    async def get_user_conversations(user_id: int, page_state: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+        cassandra_client = get_cassandra_client()
+
+        # Walk the monthly buckets newest first. The cursor is
+        # "<bucket_month>:<driver paging state within that bucket>".
+        buckets = [_bucket_month(datetime.now())]
+        for _ in range(CONVERSATION_BUCKET_LOOKBACK_MONTHS - 1):
+            buckets.append(_previous_bucket_month(buckets[-1]))
+
+        start = 0
+        bucket_page_state = None
+        if page_state:
+            # Only resume from a bucket this server would have handed out
+            bucket, _, bucket_page_state = page_state.partition(":")
+            try:
+                bucket_month = int(bucket)
+            except ValueError:
+                raise InvalidPageStateError("Invalid page_state cursor")
+            if bucket_month not in buckets:
+                raise InvalidPageStateError("Invalid page_state cursor")
+            start = buckets.index(bucket_month)
+            bucket_page_state = bucket_page_state or None
+
+        rows = []
+        next_page_state = None
+        for i in range(start, len(buckets)):
+            params = (user_id, buckets[i])
+            bucket_rows, bucket_page_state = await cassandra_client.execute_paged_aio(
+                SELECT_USER_CONVERSATIONS_CQL, params, limit - len(rows), bucket_page_state
+            )
+            rows.extend(bucket_rows)
+            if bucket_page_state:
+                next_page_state = f"{buckets[i]}:{bucket_page_state}"
+                break
+            if len(rows) >= limit:
+                if i + 1 < len(buckets):
+                    next_page_state = f"{buckets[i + 1]}:"
+                break
+
+        # Participants are always stored as (min, max) user id, and both are
+        # already on the conversations_by_user row, so no extra lookup is needed
         conversations = []
         for row in rows:
-            conversation_id = row["conversation_id"]
-
-            participants_query = """
-            SELECT user1_id, user2_id, created_at
-            FROM conversation_participants
-            WHERE conversation_id = %s
-            """
-            participants_params = (conversation_id,)
-            participants_result = cassandra_client.execute(participants_query, participants_params)
-
-            if participants_result:
-                participant = participants_result[0]
-                conversations.append({
-                    "id": conversation_id,
-                    "user1_id": participant["user1_id"],
-                    "user2_id": participant["user2_id"],
-                    "last_message_at": row["last_message_timestamp"],
-                    "last_message_content": row["last_message_content"]
-                })
-
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paged_conversations = conversations[start_idx:end_idx]
+            conversations.append({
+                "id": row["conversation_id"],
+                "user1_id": min(row["user_id"], row["other_user_id"]),
+                "user2_id": max(row["user_id"], row["other_user_id"]),
+                "last_message_at": row["last_message_timestamp"],
+                "last_message_content": row["last_message_content"]
+            })
 
         return {
-            "total": len(conversations),
-            "page": page,
             "limit": limit,
-            "data": paged_conversations
+            "next_page_state": next_page_state,
+            "data": conversations
         }
 
     @staticmethod
-    async def get_conversation(conversation_id: int) -> Dict[str, Any]:
-        query = """
-        SELECT conversation_id, user1_id, user2_id, created_at
-        FROM conversation_participants
-        WHERE conversation_id = %s
-        """
-        params = (conversation_id,)
-        rows = cassandra_client.execute(query, params)
+    async def get_conversation(conversation_id: uuid.UUID) -> Dict[str, Any]:
+        conversation = await ConversationModel._get_participants(conversation_id)
 
-        if not rows:
+        if not conversation:
             return None
 
-        last_message_query = """
-        SELECT message_timestamp, content
-        FROM messages_by_conversation
-        WHERE conversation_id = %s
-        LIMIT 1
-        """
+        cassandra_client = get_cassandra_client()
         last_message_params = (conversation_id,)
-        last_message_results = cassandra_client.execute(last_message_query, last_message_params)
-
-        conversation = rows[0]
+        last_message_results = await cassandra_client.execute_aio(SELECT_LAST_MESSAGE_CQL, last_message_params)
 
         return {
             "id": conversation["conversation_id"],
@@ -243,73 +330,63 @@ class ConversationModel:
 
     @staticmethod
     async def create_or_get_conversation(user1_id: int, user2_id: int) -> Dict[str, Any]:
+        cassandra_client = get_cassandra_client()
         min_user_id = min(user1_id, user2_id)
         max_user_id = max(user1_id, user2_id)
 
-        conversations_query = """
-        SELECT conversation_id
-        FROM conversations_by_user
-        WHERE user_id = %s
-        """
-        conversations_params = (min_user_id,)
-        conversations = cassandra_client.execute(conversations_query, conversations_params)
-
-        for conversation in conversations:
-            conversation_id = conversation["conversation_id"]
-
-            participants_query = """
-            SELECT user1_id, user2_id
-            FROM conversation_participants
-            WHERE conversation_id = %s
-            """
-            participants_params = (conversation_id,)
-            participants = cassandra_client.execute(participants_query, participants_params)
-
-            if participants:
-                participant = participants[0]
-                if ((participant["user1_id"] == min_user_id and participant["user2_id"] == max_user_id) or
-                    (participant["user1_id"] == max_user_id and participant["user2_id"] == min_user_id)):
-                    return await ConversationModel.get_conversation(conversation_id)
-
-        conversation_id = int(datetime.now().timestamp())
+        lookup_params = (min_user_id, max_user_id)
+        existing = await cassandra_client.execute_aio(SELECT_CONVERSATION_LOOKUP_CQL, lookup_params)
+
+        if existing:
+            return await ConversationModel.get_conversation(existing[0]["conversation_id"])
+
+        # Same local clock as create_message and the listing buckets; the
+        # TimeUUID is built from that value rather than uuid1()'s UTC clock
         created_at = datetime.now()
+        conversation_id = uuid_from_time(created_at)
 
-        create_query = """
-        INSERT INTO conversation_participants (
-            conversation_id, user1_id, user2_id, created_at
-        ) VALUES (%s, %s, %s, %s)
-        """
         create_params = (
             conversation_id,
             min_user_id,
             max_user_id,
             created_at
         )
-        cassandra_client.execute(create_query, create_params)
-
-        init_conversation_query = """
-        INSERT INTO conversations_by_user (
-            user_id, last_message_timestamp, conversation_id, 
-            other_user_id, last_message_content
-        ) VALUES (%s, %s, %s, %s, %s)
-        """
+
+        lookup_insert_params = (min_user_id, max_user_id, conversation_id)
+
+        bucket_month = _bucket_month(created_at)
+
         user1_params = (
             min_user_id,
+            bucket_month,
             created_at,
             conversation_id,
             max_user_id,
             None
         )
-        cassandra_client.execute(init_conversation_query, user1_params)
 
         user2_params = (
             max_user_id,
+            bucket_month,
             created_at,
             conversation_id,
             min_user_id,
             None
         )
-        cassandra_client.execute(init_conversation_query, user2_params)
+
+        await cassandra_client.execute_batch_aio([
+            (INSERT_PARTICIPANTS_CQL, create_params),
+            (INSERT_CONVERSATION_LOOKUP_CQL, lookup_insert_params),
+            (INSERT_CONVERSATION_BY_USER_CQL, user1_params),
+            (INSERT_CONVERSATION_BY_USER_CQL, user2_params)
+        ])
+
+        ConversationModel._cache_participants(conversation_id, {
+            "conversation_id": conversation_id,
+            "user1_id": min_user_id,
+            "user2_id": max_user_id,
+            "created_at": created_at
+        })
 
         return {
             "id": conversation_id,
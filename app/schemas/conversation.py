@@ -1,10 +1,11 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
+from uuid import UUID
 from app.schemas.message import MessageResponse
 
 class ConversationResponse(BaseModel):
-    id: int = Field(..., description="Unique ID of the conversation")
+    id: UUID = Field(..., description="Unique ID of the conversation")
     user1_id: int = Field(..., description="ID of the first user")
     user2_id: int = Field(..., description="ID of the second user")
     last_message_at: datetime = Field(..., description="Timestamp of the last message")
@@ -14,11 +15,10 @@ class ConversationDetail(ConversationResponse):
     messages: List[MessageResponse] = Field(..., description="List of messages in conversation")
 
 class PaginatedConversationRequest(BaseModel):
-    page: int = Field(1, description="Page number for pagination")
-    limit: int = Field(20, description="Number of items per page")
+    page_state: Optional[str] = Field(None, description="Paging cursor returned by the previous page")
+    limit: int = Field(20, ge=1, le=100, description="Number of items per page")
 
 class PaginatedConversationResponse(BaseModel):
-    total: int = Field(..., description="Total number of conversations")
-    page: int = Field(..., description="Current page number")
     limit: int = Field(..., description="Number of items per page")
+    next_page_state: Optional[str] = Field(None, description="Paging cursor for the next page, null on the last page")
     data: List[ConversationResponse] = Field(..., description="List of conversations") 
\ No newline at end of file
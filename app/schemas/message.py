@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
+from uuid import UUID
 
 class MessageBase(BaseModel):
     content: str = Field(..., description="Content of the message")
@@ -10,19 +11,22 @@ class MessageCreate(MessageBase):
     receiver_id: int = Field(..., description="ID of the receiver")
 
 class MessageResponse(MessageBase):
-    id: int = Field(..., description="Unique ID of the message")
+    # Validation aliases let rows from messages_by_conversation be validated directly
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: UUID = Field(..., validation_alias="message_id", description="Unique ID of the message")
     sender_id: int = Field(..., description="ID of the sender")
     receiver_id: int = Field(..., description="ID of the receiver")
-    created_at: datetime = Field(..., description="Timestamp when message was created")
-    conversation_id: int = Field(..., description="ID of the conversation")
+    created_at: datetime = Field(..., validation_alias="message_timestamp", description="Timestamp when message was created")
+    conversation_id: UUID = Field(..., description="ID of the conversation")
 
 class PaginatedMessageRequest(BaseModel):
-    page: int = Field(1, description="Page number for pagination")
-    limit: int = Field(20, description="Number of items per page")
+    page_state: Optional[str] = Field(None, description="Paging cursor returned by the previous page")
+    limit: int = Field(20, ge=1, le=100, description="Number of items per page")
     before_timestamp: Optional[datetime] = Field(None, description="Get messages before this timestamp")
 
 class PaginatedMessageResponse(BaseModel):
-    total: int = Field(..., description="Total number of messages")
-    page: int = Field(..., description="Current page number")
+    has_more: bool = Field(..., description="Whether more messages are available")
     limit: int = Field(..., description="Number of items per page")
+    next_page_state: Optional[str] = Field(None, description="Paging cursor for the next page, null on the last page")
     data: List[MessageResponse] = Field(..., description="List of messages") 
\ No newline at end of file
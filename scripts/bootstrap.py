@@ -0,0 +1,42 @@
+"""
+Script to initialize Cassandra and generate test data for the Messenger application.
+
+Runs setup_db and generate_test_data in one process, over a single session.
+"""
+import logging
+
+from setup_db import CASSANDRA_KEYSPACE, wait_for_cassandra, create_keyspace, create_tables
+from generate_test_data import NUM_USERS, generate_test_data
+
+logger = logging.getLogger(__name__)
+
+def main():
+    """Initialize the database and fill it with test data."""
+    logger.info("Starting Cassandra bootstrap...")
+    
+    # Wait for Cassandra to be ready
+    cluster = wait_for_cassandra()
+    
+    try:
+        # One session does the schema setup and the inserts
+        session = cluster.connect()
+        
+        # Create keyspace and tables
+        create_keyspace(session)
+        create_tables(session)
+        
+        # The test data inserts use unqualified table names
+        session.set_keyspace(CASSANDRA_KEYSPACE)
+        generate_test_data(session)
+        
+        logger.info(f"User IDs range from 1 to {NUM_USERS}")
+        logger.info("Cassandra bootstrap completed successfully.")
+    except Exception as e:
+        logger.error(f"Error during bootstrap: {str(e)}")
+        raise
+    finally:
+        if cluster:
+            cluster.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,21 @@ import os
 import uuid
 import logging
 import random
+import itertools
+from multiprocessing import Pool
 from datetime import datetime, timedelta
 from cassandra.cluster import Cluster
+from cassandra.concurrent import execute_concurrent
+from cassandra.policies import DCAwareRoundRobinPolicy, TokenAwarePolicy
+from cassandra.protocol import HAVE_CYTHON
+from cassandra.query import BatchStatement, BatchType
+from cassandra.util import uuid_from_time
+
+try:
+    # The libev reactor handles sockets in C, but needs the driver's optional extension
+    from cassandra.io.libevreactor import LibevConnection as ConnectionClass
+except ImportError:
+    from cassandra.io.asyncioreactor import AsyncioConnection as ConnectionClass
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,12 +33,58 @@ CASSANDRA_KEYSPACE = os.getenv("CASSANDRA_KEYSPACE", "messenger")
 NUM_USERS = 10  # Number of users to create
 NUM_CONVERSATIONS = 15  # Number of conversations to create
 MAX_MESSAGES_PER_CONVERSATION = 50  # Maximum number of messages per conversation
+INSERT_CONCURRENCY = 100  # Maximum number of inserts in flight at once
+MESSAGE_BATCH_SIZE = 100  # Maximum number of messages per single-partition batch
+MESSAGE_MIN_OFFSET_SECONDS = 3600  # Earliest message, relative to conversation creation
+MESSAGE_MAX_OFFSET_SECONDS = 73 * 3600  # Latest message (exclusive), relative to creation
+NUM_WORKERS = int(os.getenv("TEST_DATA_WORKERS", "1"))  # Processes generating data; raise for large runs
+
+INSERT_PARTICIPANTS_CQL = """
+INSERT INTO conversation_participants (
+    conversation_id, user1_id, user2_id, created_at
+) VALUES (?, ?, ?, ?)
+"""
+
+INSERT_CONVERSATION_LOOKUP_CQL = """
+INSERT INTO conversation_lookup (
+    user1_id, user2_id, conversation_id
+) VALUES (?, ?, ?)
+"""
+
+INSERT_MESSAGE_CQL = """
+INSERT INTO messages_by_conversation (
+    conversation_id, message_timestamp, message_id,
+    sender_id, receiver_id, content
+) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_CONVERSATION_BY_USER_CQL = """
+INSERT INTO conversations_by_user (
+    user_id, bucket_month, last_message_timestamp, conversation_id,
+    other_user_id, last_message_content
+) VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_LAST_MESSAGE_CQL = """
+INSERT INTO conversation_last_message (
+    conversation_id, message_timestamp, sender_id, content
+) VALUES (?, ?, ?, ?)
+"""
 
 def connect_to_cassandra():
     """Connect to Cassandra cluster."""
     logger.info("Connecting to Cassandra...")
+    if not HAVE_CYTHON:
+        # The driver only uses its compiled protocol handler when these are built
+        logger.warning("cassandra-driver Cython extensions not found; row encoding will run in pure Python")
     try:
-        cluster = Cluster([CASSANDRA_HOST])
+        cluster = Cluster(
+            [CASSANDRA_HOST],
+            load_balancing_policy=TokenAwarePolicy(DCAwareRoundRobinPolicy()),
+            connection_class=ConnectionClass,
+            protocol_version=4,
+            compression="lz4"  # The repetitive message content compresses well on the wire
+        )
         session = cluster.connect(CASSANDRA_KEYSPACE)
         logger.info("Connected to Cassandra!")
         return cluster, session
@@ -33,119 +92,178 @@ def connect_to_cassandra():
         logger.error(f"Failed to connect to Cassandra: {str(e)}")
         raise
 
-def generate_test_data(session):
+def draw_user_pairs(num_conversations=NUM_CONVERSATIONS):
+    """
+    Pick a distinct pair of users for every conversation, lower ID first.
+    
+    conversation_lookup holds one conversation per pair, so a repeated pair
+    would leave a conversation the app can never find again.
+    """
+    user_ids = range(1, NUM_USERS + 1)
+    return random.sample(list(itertools.combinations(user_ids, 2)), num_conversations)
+
+def generate_test_data(session, user_pairs=None):
     """
-    Generate test data in Cassandra.
+    Generate test data in Cassandra, one conversation per user pair.
+    
+    Draws NUM_CONVERSATIONS pairs when none are given.
+    Returns the number of messages generated.
     """
     logger.info("Generating test data...")
     
-    # Create user IDs (1 to NUM_USERS)
-    user_ids = list(range(1, NUM_USERS + 1))
+    # Prepare each insert once; executions then only ship the bound values
+    insert_participants = session.prepare(INSERT_PARTICIPANTS_CQL)
+    insert_conversation_lookup = session.prepare(INSERT_CONVERSATION_LOOKUP_CQL)
+    insert_message = session.prepare(INSERT_MESSAGE_CQL)
+    insert_conversation_by_user = session.prepare(INSERT_CONVERSATION_BY_USER_CQL)
+    insert_last_message = session.prepare(INSERT_LAST_MESSAGE_CQL)
     
-    # Create conversations between random pairs of users
-    conversations = []
-    for i in range(NUM_CONVERSATIONS):
-        # Select two random users
-        user1, user2 = random.sample(user_ids, 2)
-        
-        # Create a conversation ID (timestamp-based for simplicity)
-        conversation_id = int(datetime.now().timestamp()) + i
-        created_at = datetime.now() - timedelta(days=random.randint(1, 30))
-        
-        # Store conversation
-        conversations.append({
-            "id": conversation_id,
-            "user1_id": min(user1, user2),  # Store in consistent order
-            "user2_id": max(user1, user2),
-            "created_at": created_at
-        })
-        
-        # Insert into conversation_participants
-        session.execute(
-            """
-            INSERT INTO conversation_participants (
-                conversation_id, user1_id, user2_id, created_at
-            ) VALUES (%s, %s, %s, %s)
-            """,
-            (conversation_id, min(user1, user2), max(user1, user2), created_at)
-        )
-        
-        # Generate messages for this conversation
-        num_messages = random.randint(5, MAX_MESSAGES_PER_CONVERSATION)
-        last_message_timestamp = None
-        last_message_content = None
+    # Message content is "<prefix><direction>", built from pieces formatted once
+    content_prefixes = [f"Test message {j + 1}" for j in range(MAX_MESSAGES_PER_CONVERSATION)]
+    
+    if user_pairs is None:
+        user_pairs = draw_user_pairs()
+    
+    # Conversations are dated relative to one clock read
+    base_now = datetime.now()
+    num_generated_messages = 0
+    
+    def generate_inserts():
+        """Yield (statement, params) pairs for every table, one conversation at a time."""
+        nonlocal num_generated_messages
         
-        for j in range(num_messages):
-            # Decide sender and receiver
-            if random.random() < 0.5:
-                sender_id, receiver_id = user1, user2
-            else:
-                sender_id, receiver_id = user2, user1
+        for user1, user2 in user_pairs:
+            # Create a conversation ID (TimeUUID carrying the creation time)
+            created_at = base_now - timedelta(days=random.randint(1, 30))
+            conversation_id = uuid_from_time(created_at)
             
-            # Create a message
-            message_id = uuid.uuid4()
-            message_timestamp = created_at + timedelta(
-                hours=random.randint(1, 72),
-                minutes=random.randint(0, 59),
-                seconds=random.randint(0, 59)
+            yield (
+                insert_participants,
+                (conversation_id, user1, user2, created_at)
+            )
+            yield (
+                insert_conversation_lookup,
+                (user1, user2, conversation_id)
             )
-            content = f"Test message {j + 1} from User {sender_id} to User {receiver_id}"
             
-            # Track the last message
-            if last_message_timestamp is None or message_timestamp > last_message_timestamp:
-                last_message_timestamp = message_timestamp
-                last_message_content = content
+            # Generate messages for this conversation
+            content_directions = {
+                user1: f" from User {user1} to User {user2}",
+                user2: f" from User {user2} to User {user1}"
+            }
+            num_messages = random.randint(5, MAX_MESSAGES_PER_CONVERSATION)
+            message_batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+            # Random bytes for every message ID of the conversation, read in one call
+            message_id_bytes = os.urandom(16 * num_messages)
+            last_message_timestamp = None
+            last_message_content = None
+            last_message_sender_id = None
             
-            # Insert into messages_by_conversation
-            session.execute(
-                """
-                INSERT INTO messages_by_conversation (
-                    conversation_id, message_timestamp, message_id, 
-                    sender_id, receiver_id, content
-                ) VALUES (%s, %s, %s, %s, %s, %s)
-                """,
-                (conversation_id, message_timestamp, message_id, sender_id, receiver_id, content)
-            )
-        
-        # Update conversations_by_user for both users
-        if last_message_timestamp:
-            # For user1
-            session.execute(
-                """
-                INSERT INTO conversations_by_user (
-                    user_id, last_message_timestamp, conversation_id, 
-                    other_user_id, last_message_content
-                ) VALUES (%s, %s, %s, %s, %s)
-                """,
-                (user1, last_message_timestamp, conversation_id, user2, last_message_content)
-            )
+            for j in range(num_messages):
+                # Decide sender and receiver
+                if random.getrandbits(1):
+                    sender_id, receiver_id = user1, user2
+                else:
+                    sender_id, receiver_id = user2, user1
+                
+                # Create a message
+                # version=4 sets the version and variant bits, as uuid.uuid4() does
+                message_id = uuid.UUID(bytes=message_id_bytes[16 * j:16 * (j + 1)], version=4)
+                # Between 1 and 73 hours after the conversation was created
+                message_timestamp = created_at + timedelta(
+                    seconds=random.randrange(MESSAGE_MIN_OFFSET_SECONDS, MESSAGE_MAX_OFFSET_SECONDS)
+                )
+                content = content_prefixes[j] + content_directions[sender_id]
+                
+                # Track the last message
+                if last_message_timestamp is None or message_timestamp > last_message_timestamp:
+                    last_message_timestamp = message_timestamp
+                    last_message_content = content
+                    last_message_sender_id = sender_id
+                
+                # Messages share the conversation's partition, so they can go in one batch
+                message_batch.add(
+                    insert_message,
+                    (conversation_id, message_timestamp, message_id, sender_id, receiver_id, content)
+                )
+                if len(message_batch) == MESSAGE_BATCH_SIZE:
+                    yield message_batch, None
+                    message_batch = BatchStatement(batch_type=BatchType.UNLOGGED)
+            if len(message_batch):
+                yield message_batch, None
+            num_generated_messages += num_messages
             
-            # For user2
-            session.execute(
-                """
-                INSERT INTO conversations_by_user (
-                    user_id, last_message_timestamp, conversation_id, 
-                    other_user_id, last_message_content
-                ) VALUES (%s, %s, %s, %s, %s)
-                """,
-                (user2, last_message_timestamp, conversation_id, user1, last_message_content)
-            )
+            # Update conversations_by_user for both users
+            if last_message_timestamp:
+                bucket_month = last_message_timestamp.year * 100 + last_message_timestamp.month
+                
+                yield (
+                    insert_conversation_by_user,
+                    (user1, bucket_month, last_message_timestamp, conversation_id, user2, last_message_content)
+                )
+                yield (
+                    insert_conversation_by_user,
+                    (user2, bucket_month, last_message_timestamp, conversation_id, user1, last_message_content)
+                )
+                
+                # Latest message of the conversation
+                yield (
+                    insert_last_message,
+                    (conversation_id, last_message_timestamp, last_message_sender_id, last_message_content)
+                )
+    
+    # Stream the inserts through the concurrency window, so only about
+    # INSERT_CONCURRENCY of them are held in memory at once. Rows for different
+    # partitions are pipelined rather than batched.
+    results = execute_concurrent(
+        session, generate_inserts(), concurrency=INSERT_CONCURRENCY, results_generator=True
+    )
+    for _ in results:
+        pass
     
-    logger.info(f"Generated {NUM_CONVERSATIONS} conversations with messages")
-    logger.info(f"User IDs range from 1 to {NUM_USERS}")
-    logger.info("Use these IDs for testing the API endpoints")
+    logger.info(f"Generated {len(user_pairs)} conversations with {num_generated_messages} messages")
+    return num_generated_messages
+
+def _generate_in_worker(user_pairs):
+    """Generate the conversations for a slice of the user pairs in a worker process."""
+    # Forked workers inherit the parent's RNG state; reseed so their data differs
+    random.seed()
+    
+    # Driver sessions cannot be shared across processes, so each worker connects itself
+    cluster, session = connect_to_cassandra()
+    try:
+        return generate_test_data(session, user_pairs)
+    finally:
+        cluster.shutdown()
+
+def generate_test_data_parallel(num_workers=NUM_WORKERS):
+    """
+    Generate test data with the conversations split across worker processes.
+    
+    Returns the number of messages generated.
+    """
+    # Draw the pairs once here so no two workers create the same conversation
+    user_pairs = draw_user_pairs()
+    shares = [user_pairs[k::num_workers] for k in range(num_workers)]
+    with Pool(num_workers) as pool:
+        return sum(pool.map(_generate_in_worker, [share for share in shares if share]))
 
 def main():
     """Main function to generate test data."""
     cluster = None
     
     try:
-        # Connect to Cassandra
-        cluster, session = connect_to_cassandra()
-        
-        # Generate test data
-        generate_test_data(session)
+        if NUM_WORKERS > 1:
+            generate_test_data_parallel(NUM_WORKERS)
+        else:
+            # Connect to Cassandra
+            cluster, session = connect_to_cassandra()
+            
+            # Generate test data
+            generate_test_data(session)
         
+        logger.info(f"User IDs range from 1 to {NUM_USERS}")
+        logger.info("Use these IDs for testing the API endpoints")
         logger.info("Test data generation completed successfully!")
     except Exception as e:
         logger.error(f"Error generating test data: {str(e)}")
@@ -14,21 +14,29 @@ logger = logging.getLogger(__name__)
 CASSANDRA_HOST = os.getenv("CASSANDRA_HOST", "localhost")
 CASSANDRA_PORT = int(os.getenv("CASSANDRA_PORT", "9042"))
 CASSANDRA_KEYSPACE = os.getenv("CASSANDRA_KEYSPACE", "messenger")
+CASSANDRA_RF = int(os.getenv("CASSANDRA_RF", "1"))  # Replication factor for the keyspace
 
 def wait_for_cassandra():
     """Wait for Cassandra to be ready before proceeding."""
     logger.info("Waiting for Cassandra to be ready...")
     cluster = None
+    delay = 0.25  # Back off exponentially from 0.25s, capped at 5s
     
-    for _ in range(10):  # Try 10 times
+    for _ in range(12):  # Try 12 times
         try:
-            cluster = Cluster([CASSANDRA_HOST])
+            cluster = Cluster(
+                [CASSANDRA_HOST],
+                connect_timeout=2,
+                protocol_version=4,
+                compression="lz4"
+            )
             session = cluster.connect()
             logger.info("Cassandra is ready!")
             return cluster
         except Exception as e:
-            logger.warning(f"Cassandra not ready yet: {str(e)}")
-            time.sleep(5)  # Wait 5 seconds before trying again
+            logger.warning(f"Cassandra not ready yet, retrying in {delay}s: {str(e)}")
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
     
     logger.error("Failed to connect to Cassandra after multiple attempts.")
     raise Exception("Could not connect to Cassandra")
@@ -39,13 +47,13 @@ def create_keyspace(session):
     """
     logger.info(f"Creating keyspace {CASSANDRA_KEYSPACE} if it doesn't exist...")
     
-    # Using SimpleStrategy with replication factor 3 for development
-    # In production, NetworkTopologyStrategy would be more appropriate
+    # Using SimpleStrategy with CASSANDRA_RF (default 1, for a single dev node)
+    # In production, set CASSANDRA_RF=3 and use NetworkTopologyStrategy
     query = f"""
     CREATE KEYSPACE IF NOT EXISTS {CASSANDRA_KEYSPACE}
     WITH REPLICATION = {{
         'class': 'SimpleStrategy',
-        'replication_factor': 3
+        'replication_factor': {CASSANDRA_RF}
     }};
     """
     
@@ -55,44 +63,79 @@ def create_keyspace(session):
 def create_tables(session):
     """
     Create the tables for the application.
+    
+    Table names are qualified with the keyspace, so the session needs no USE.
     """
     logger.info("Creating tables...")
     
+    # Issue every CREATE TABLE at once so their schema agreement waits overlap
+    futures = []
+    
     # Table 1: messages_by_conversation - Stores messages organized by conversation
-    session.execute("""
-    CREATE TABLE IF NOT EXISTS messages_by_conversation (
-        conversation_id int,
+    # Small LZ4 chunks keep per-read decompression cheap for history pages
+    futures.append(session.execute_async(f"""
+    CREATE TABLE IF NOT EXISTS {CASSANDRA_KEYSPACE}.messages_by_conversation (
+        conversation_id timeuuid,
         message_timestamp timestamp,
         message_id uuid,
         sender_id int,
         receiver_id int,
         content text,
         PRIMARY KEY ((conversation_id), message_timestamp, message_id)
-    ) WITH CLUSTERING ORDER BY (message_timestamp DESC, message_id ASC);
-    """)
+    ) WITH CLUSTERING ORDER BY (message_timestamp DESC, message_id ASC)
+    AND compression = {{
+        'class': 'LZ4Compressor',
+        'chunk_length_in_kb': 4
+    }};
+    """))
     
     # Table 2: conversations_by_user - Tracks conversations for a user
-    session.execute("""
-    CREATE TABLE IF NOT EXISTS conversations_by_user (
+    futures.append(session.execute_async(f"""
+    CREATE TABLE IF NOT EXISTS {CASSANDRA_KEYSPACE}.conversations_by_user (
         user_id int,
+        bucket_month int,
         last_message_timestamp timestamp,
-        conversation_id int,
+        conversation_id timeuuid,
         other_user_id int,
         last_message_content text,
-        PRIMARY KEY ((user_id), last_message_timestamp, conversation_id)
+        PRIMARY KEY ((user_id, bucket_month), last_message_timestamp, conversation_id)
     ) WITH CLUSTERING ORDER BY (last_message_timestamp DESC, conversation_id ASC);
-    """)
+    """))
     
     # Table 3: conversation_participants - Stores conversation metadata
-    session.execute("""
-    CREATE TABLE IF NOT EXISTS conversation_participants (
-        conversation_id int,
+    futures.append(session.execute_async(f"""
+    CREATE TABLE IF NOT EXISTS {CASSANDRA_KEYSPACE}.conversation_participants (
+        conversation_id timeuuid,
         user1_id int,
         user2_id int,
         created_at timestamp,
         PRIMARY KEY (conversation_id)
     );
-    """)
+    """))
+    
+    # Table 4: conversation_lookup - Finds the conversation between two users
+    futures.append(session.execute_async(f"""
+    CREATE TABLE IF NOT EXISTS {CASSANDRA_KEYSPACE}.conversation_lookup (
+        user1_id int,
+        user2_id int,
+        conversation_id timeuuid,
+        PRIMARY KEY ((user1_id, user2_id))
+    );
+    """))
+    
+    # Table 5: conversation_last_message - Latest message of each conversation
+    futures.append(session.execute_async(f"""
+    CREATE TABLE IF NOT EXISTS {CASSANDRA_KEYSPACE}.conversation_last_message (
+        conversation_id timeuuid,
+        message_timestamp timestamp,
+        sender_id int,
+        content text,
+        PRIMARY KEY (conversation_id)
+    );
+    """))
+    
+    for future in futures:
+        future.result()
     
     logger.info("Tables created successfully.")
 
@@ -109,7 +152,6 @@ def main():
         
         # Create keyspace and tables
         create_keyspace(session)
-        session.set_keyspace(CASSANDRA_KEYSPACE)
         create_tables(session)
         
         logger.info("Cassandra initialization completed successfully.")